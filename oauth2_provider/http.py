@@ -1,4 +1,4 @@
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
 from django.core.exceptions import DisallowedRedirect
 from django.http import HttpResponse
@@ -25,7 +25,7 @@ class OAuth2ResponseRedirect(HttpResponse):
         return self["Location"]
 
     def validate_redirect(self, redirect_to):
-        parsed = urlparse(str(redirect_to))
+        parsed = urlsplit(str(redirect_to))
         if not parsed.scheme:
             raise DisallowedRedirect("OAuth2 redirects require a URI scheme.")
         if parsed.scheme not in self.allowed_schemes:
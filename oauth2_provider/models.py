@@ -2,7 +2,7 @@ import logging
 import time
 import uuid
 from datetime import timedelta
-from urllib.parse import parse_qsl, urlparse
+from urllib.parse import parse_qsl, urlparse, urlsplit
 
 from django.apps import apps
 from django.conf import settings
@@ -170,7 +170,7 @@ class AbstractApplication(models.Model):
             validator = RedirectURIValidator(WildcardSet())
             for uri in redirect_uris:
                 validator(uri)
-                scheme = urlparse(uri).scheme
+                scheme = urlsplit(uri).scheme
                 if scheme not in allowed_schemes:
                     raise ValidationError(_("Unauthorized redirect scheme: {scheme}").format(scheme=scheme))
 
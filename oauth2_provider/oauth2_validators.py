@@ -874,13 +874,17 @@ class OAuth2Validator(RequestValidator):
         return True
 
     def _load_id_token(self, token):
+        # A JWS in compact serialization always has three dot separated parts,
+        # reject anything else before parsing it or verifying any signature
+        if token.count(".") != 2:
+            return None
         key = self._get_key_for_token(token)
         if not key:
             return None
         try:
             jwt_token = jwt.JWT(key=key, jwt=token)
             claims = json.loads(jwt_token.claims)
-            return IDToken.objects.get(jti=claims["jti"])
+            return IDToken.objects.select_related("application", "user").get(jti=claims["jti"])
         except (JWException, JWTExpired, IDToken.DoesNotExist):
             return None
 
@@ -24,6 +24,9 @@ from .mixins import OAuthLibMixin
 
 log = logging.getLogger("oauth2_provider")
 
+Application = get_application_model()
+AccessToken = get_access_token_model()
+
 
 class BaseAuthorizationView(LoginRequiredMixin, OAuthLibMixin, View):
     """
@@ -110,7 +113,7 @@ class AuthorizationView(BaseAuthorizationView, FormView):
 
     def form_valid(self, form):
         client_id = form.cleaned_data["client_id"]
-        application = get_application_model().objects.get(client_id=client_id)
+        application = Application.objects.get(client_id=client_id)
         credentials = {
             "client_id": form.cleaned_data.get("client_id"),
             "redirect_uri": form.cleaned_data.get("redirect_uri"),
@@ -154,10 +157,11 @@ class AuthorizationView(BaseAuthorizationView, FormView):
         all_scopes = get_scopes_backend().get_all_scopes()
         kwargs["scopes_descriptions"] = [all_scopes[scope] for scope in scopes]
         kwargs["scopes"] = scopes
-        # at this point we know an Application instance with such client_id exists in the database
-
-        # TODO: Cache this!
-        application = get_application_model().objects.get(client_id=credentials["client_id"])
+        # at this point we know an Application instance with such client_id exists in the database,
+        # and the validator has already loaded it on the oauthlib request
+        application = getattr(credentials.get("request"), "client", None)
+        if application is None:
+            application = Application.objects.get(client_id=credentials["client_id"])
 
         kwargs["application"] = application
         kwargs["client_id"] = credentials["client_id"]
@@ -194,13 +198,9 @@ class AuthorizationView(BaseAuthorizationView, FormView):
                 return self.redirect(uri, application)
 
             elif require_approval == "auto":
-                tokens = (
-                    get_access_token_model()
-                    .objects.filter(
-                        user=request.user, application=kwargs["application"], expires__gt=timezone.now()
-                    )
-                    .all()
-                )
+                tokens = AccessToken.objects.filter(
+                    user=request.user, application=kwargs["application"], expires__gt=timezone.now()
+                ).all()
 
                 # check past authorizations regarded the same scopes as the current one
                 for token in tokens:
@@ -262,7 +262,7 @@ class TokenView(OAuthLibMixin, View):
         if status == 200:
             access_token = json.loads(body).get("access_token")
             if access_token is not None:
-                token = get_access_token_model().objects.get(token=access_token)
+                token = AccessToken.objects.get(token=access_token)
                 app_authorized.send(sender=self, request=request, token=token)
         response = HttpResponse(content=body, status=status)
 
@@ -1,9 +1,15 @@
+import hashlib
 import json
+from functools import lru_cache
 from urllib.parse import urlparse
 
-from django.http import HttpResponse, JsonResponse
-from django.urls import reverse
+from django.http import HttpResponse
+from django.test.signals import setting_changed
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import View
 from jwcrypto import jwk
@@ -15,6 +21,106 @@ from .mixins import OAuthLibMixin, OIDCOnlyMixin
 
 Application = get_application_model()
 
+# Serialized discovery documents, keyed on everything the issuer and endpoint URLs depend on
+_discovery_cache = {}
+DISCOVERY_CACHE_MAXSIZE = 8
+
+
+@lru_cache(maxsize=None)
+def _cached_reverse(viewname, urlconf, prefix, language):
+    return reverse(viewname, urlconf=urlconf)
+
+
+def _reverse(viewname):
+    """
+    Cached `reverse` for the argument-less OIDC endpoints.
+
+    The result depends on the active urlconf, the script prefix and, for
+    URLs under `i18n_patterns`, the active language, so all of them are part
+    of the cache key.
+    """
+    return _cached_reverse(viewname, get_urlconf(), get_script_prefix(), get_language())
+
+
+@lru_cache(maxsize=1)
+def _cached_validator(validator_class):
+    return validator_class()
+
+
+def _validator(validator_class):
+    """
+    Return a validator instance shared between requests, like the one held by
+    OAuthLibMixin's cached OAuthlibCore, unless ALWAYS_RELOAD_OAUTHLIB_CORE is True.
+    """
+    if oauth2_settings.ALWAYS_RELOAD_OAUTHLIB_CORE:
+        return validator_class()
+    return _cached_validator(validator_class)
+
+
+def _json_content(data):
+    """
+    Serialize `data` to compact UTF-8 encoded JSON.
+
+    The OIDC documents only contain strings and lists, so the stdlib encoder is
+    used directly rather than going through JsonResponse and DjangoJSONEncoder.
+    """
+    return json.dumps(data, separators=(",", ":")).encode("utf8")
+
+
+def _etag(content):
+    return quote_etag(hashlib.blake2b(content, digest_size=8).hexdigest())
+
+
+@lru_cache(maxsize=4)
+def _jwks_content(pems):
+    """
+    Return the serialized JWK set for a tuple of PEM encoded keys, and its ETag.
+
+    The JWK set only changes when keys are rotated, so it is cached per key set.
+    """
+    content = _json_content({"keys": [_jwk_entry(pem) for pem in pems]})
+    return content, _etag(content)
+
+
+def _conditional_json_response(request, content, etag, headers):
+    """
+    Return `content` as a JSON response, or a 304 Not Modified response if
+    the client already holds the representation identified by `etag`.
+    """
+    response = HttpResponse(content, content_type="application/json")
+    response["ETag"] = etag
+    response = get_conditional_response(request, etag=etag, response=response)
+    for k, v in headers.items():
+        response[k] = v
+    return response
+
+
+@lru_cache(maxsize=None)
+def _jwks_cache_control(max_age):
+    return f"public, max-age={max_age}, stale-while-revalidate={max_age}, stale-if-error={max_age}"
+
+
+@lru_cache(maxsize=None)
+def _iss_host(endpoint):
+    parsed_url = urlparse(endpoint)
+    return parsed_url.scheme + "://" + parsed_url.netloc
+
+
+@lru_cache(maxsize=16)
+def _jwk_entry(pem):
+    """
+    Return the public JWK set entry for a PEM encoded private key.
+
+    Parsing the PEM is expensive and the configured keys rarely change, so the
+    result is cached per key.
+    """
+    key = jwk.JWK.from_pem(pem.encode("utf8"))
+    public = json.loads(key.export_public())
+    # Recent jwcrypto versions already set the thumbprint as kid on import
+    data = {"alg": "RS256", "use": "sig", "kid": public.get("kid") or key.thumbprint()}
+    data.update(public)
+    return data
+
 
 class ConnectDiscoveryInfoView(OIDCOnlyMixin, View):
     """
@@ -23,36 +129,58 @@ class ConnectDiscoveryInfoView(OIDCOnlyMixin, View):
     """
 
     def get(self, request, *args, **kwargs):
+        if oauth2_settings.OIDC_DISCOVERY_CACHE_ENABLE:
+            cache_key = (
+                request.scheme,
+                request.get_host(),
+                bool(oauth2_settings.OIDC_ISS_ENDPOINT),
+                get_urlconf(),
+                get_script_prefix(),
+                get_language(),
+            )
+            cached = _discovery_cache.get(cache_key)
+            if cached is None:
+                content = _json_content(self.get_discovery_data(request))
+                cached = (content, _etag(content))
+                if len(_discovery_cache) >= DISCOVERY_CACHE_MAXSIZE:
+                    _discovery_cache.clear()
+                _discovery_cache[cache_key] = cached
+            content, etag = cached
+        else:
+            content = _json_content(self.get_discovery_data(request))
+            etag = _etag(content)
+        return _conditional_json_response(request, content, etag, {"Access-Control-Allow-Origin": "*"})
+
+    def get_discovery_data(self, request):
+        """
+        Build the provider metadata document for the given request.
+        """
         issuer_url = oauth2_settings.OIDC_ISS_ENDPOINT
 
         if not issuer_url:
             issuer_url = oauth2_settings.oidc_issuer(request)
-            authorization_endpoint = request.build_absolute_uri(reverse("oauth2_provider:authorize"))
-            token_endpoint = request.build_absolute_uri(reverse("oauth2_provider:token"))
-            userinfo_endpoint = oauth2_settings.OIDC_USERINFO_ENDPOINT or request.build_absolute_uri(
-                reverse("oauth2_provider:user-info")
-            )
-            jwks_uri = request.build_absolute_uri(reverse("oauth2_provider:jwks-info"))
+            # Equivalent to request.build_absolute_uri() for the absolute paths returned by reverse()
+            host = f"{request.scheme}://{request.get_host()}"
         else:
-            parsed_url = urlparse(oauth2_settings.OIDC_ISS_ENDPOINT)
-            host = parsed_url.scheme + "://" + parsed_url.netloc
-            authorization_endpoint = "{}{}".format(host, reverse("oauth2_provider:authorize"))
-            token_endpoint = "{}{}".format(host, reverse("oauth2_provider:token"))
-            userinfo_endpoint = oauth2_settings.OIDC_USERINFO_ENDPOINT or "{}{}".format(
-                host, reverse("oauth2_provider:user-info")
-            )
-            jwks_uri = "{}{}".format(host, reverse("oauth2_provider:jwks-info"))
+            host = _iss_host(issuer_url)
+
+        authorization_endpoint = host + _reverse("oauth2_provider:authorize")
+        token_endpoint = host + _reverse("oauth2_provider:token")
+        userinfo_endpoint = oauth2_settings.OIDC_USERINFO_ENDPOINT or (
+            host + _reverse("oauth2_provider:user-info")
+        )
+        jwks_uri = host + _reverse("oauth2_provider:jwks-info")
 
         signing_algorithms = [Application.HS256_ALGORITHM]
         if oauth2_settings.OIDC_RSA_PRIVATE_KEY:
             signing_algorithms = [Application.RS256_ALGORITHM, Application.HS256_ALGORITHM]
 
         validator_class = oauth2_settings.OAUTH2_VALIDATOR_CLASS
-        validator = validator_class()
-        oidc_claims = list(set(validator.get_discovery_claims(request)))
+        validator = _validator(validator_class)
+        oidc_claims = sorted(set(validator.get_discovery_claims(request)))
         scopes_class = oauth2_settings.SCOPES_BACKEND_CLASS
         scopes = scopes_class()
-        scopes_supported = [scope for scope in scopes.get_available_scopes()]
+        scopes_supported = list(scopes.get_available_scopes())
 
         data = {
             "issuer": issuer_url,
@@ -69,9 +197,7 @@ class ConnectDiscoveryInfoView(OIDCOnlyMixin, View):
             ),
             "claims_supported": oidc_claims,
         }
-        response = JsonResponse(data)
-        response["Access-Control-Allow-Origin"] = "*"
-        return response
+        return data
 
 
 class JwksInfoView(OIDCOnlyMixin, View):
@@ -80,26 +206,15 @@ class JwksInfoView(OIDCOnlyMixin, View):
     """
 
     def get(self, request, *args, **kwargs):
-        keys = []
+        pems = ()
         if oauth2_settings.OIDC_RSA_PRIVATE_KEY:
-            for pem in [
-                oauth2_settings.OIDC_RSA_PRIVATE_KEY,
-                *oauth2_settings.OIDC_RSA_PRIVATE_KEYS_INACTIVE,
-            ]:
-
-                key = jwk.JWK.from_pem(pem.encode("utf8"))
-                data = {"alg": "RS256", "use": "sig", "kid": key.thumbprint()}
-                data.update(json.loads(key.export_public()))
-                keys.append(data)
-        response = JsonResponse({"keys": keys})
-        response["Access-Control-Allow-Origin"] = "*"
-        response["Cache-Control"] = (
-            "Cache-Control: public, "
-            + f"max-age={oauth2_settings.OIDC_JWKS_MAX_AGE_SECONDS}, "
-            + f"stale-while-revalidate={oauth2_settings.OIDC_JWKS_MAX_AGE_SECONDS}, "
-            + f"stale-if-error={oauth2_settings.OIDC_JWKS_MAX_AGE_SECONDS}"
-        )
-        return response
+            pems = (oauth2_settings.OIDC_RSA_PRIVATE_KEY, *oauth2_settings.OIDC_RSA_PRIVATE_KEYS_INACTIVE)
+        content, etag = _jwks_content(pems)
+        headers = {
+            "Access-Control-Allow-Origin": "*",
+            "Cache-Control": _jwks_cache_control(oauth2_settings.OIDC_JWKS_MAX_AGE_SECONDS),
+        }
+        return _conditional_json_response(request, content, etag, headers)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -121,3 +236,14 @@ class UserInfoView(OIDCOnlyMixin, OAuthLibMixin, View):
         for k, v in headers.items():
             response[k] = v
         return response
+
+
+def clear_oidc_caches(*args, **kwargs):
+    setting = kwargs["setting"]
+    if setting in ("OAUTH2_PROVIDER", "ROOT_URLCONF"):
+        _discovery_cache.clear()
+        _cached_reverse.cache_clear()
+        _cached_validator.cache_clear()
+
+
+setting_changed.connect(clear_oidc_caches)
@@ -7,7 +7,9 @@ from urllib.parse import parse_qs, urlparse
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.crypto import get_random_string
@@ -159,6 +161,30 @@ class TestAuthorizationCodeView(BaseTest):
         self.assertEqual(form["scope"].value(), "read write")
         self.assertEqual(form["client_id"].value(), self.application.client_id)
 
+    def test_pre_auth_loads_application_once(self):
+        """
+        Test the application loaded while validating the request is reused by the view
+        """
+        self.oauth2_settings.PKCE_REQUIRED = False
+        self.client.login(username="test_user", password="123456")
+
+        query_data = {
+            "client_id": self.application.client_id,
+            "response_type": "code",
+            "state": "random_state_string",
+            "scope": "read write",
+            "redirect_uri": "http://example.org",
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("oauth2_provider:authorize"), data=query_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["application"], self.application)
+
+        application_table = 'FROM "{}"'.format(Application._meta.db_table)
+        application_queries = [q for q in queries if application_table in q["sql"]]
+        self.assertEqual(len(application_queries), 1)
+
     def test_pre_auth_valid_client_custom_redirect_uri_scheme(self):
         """
         Test response for a valid client_id with response_type: code
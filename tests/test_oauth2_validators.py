@@ -501,6 +501,28 @@ def test_validate_id_token_no_token(oauth2_settings, mocker):
     assert status is False
 
 
+@pytest.mark.django_db
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+def test_validate_id_token_loads_related(oauth2_settings, mocker, oidc_tokens, django_assert_num_queries):
+    validator = OAuth2Validator()
+    request = mocker.MagicMock()
+    # One query to find the application from the audience, one for the token with its relations
+    with django_assert_num_queries(2):
+        status = validator.validate_id_token(oidc_tokens.id_token, ["openid"], request)
+        assert request.client.client_id == oidc_tokens.application.client_id
+        assert request.user.pk == oidc_tokens.user.pk
+    assert status is True
+
+
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+def test_validate_id_token_malformed(oauth2_settings, mocker):
+    get_key = mocker.patch.object(OAuth2Validator, "_get_key_for_token")
+    validator = OAuth2Validator()
+    status = validator.validate_id_token("not-a.jwt", ["openid"], mocker.sentinel.request)
+    assert status is False
+    get_key.assert_not_called()
+
+
 @pytest.mark.django_db
 @pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
 def test_validate_id_token_app_removed(oauth2_settings, mocker, oidc_tokens):
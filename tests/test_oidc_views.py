@@ -1,8 +1,13 @@
 import pytest
 from django.test import TestCase
-from django.urls import reverse
+from django.urls import reverse, set_urlconf
+from django.urls.base import clear_script_prefix, set_script_prefix
+from django.utils import translation
+from jwcrypto import jwk
 
 from oauth2_provider.oauth2_validators import OAuth2Validator
+from oauth2_provider.scopes import SettingsScopes
+from oauth2_provider.views.oidc import _jwk_entry, _jwks_content, _reverse
 
 from . import presets
 
@@ -70,6 +75,154 @@ class TestConnectDiscoveryInfoView(TestCase):
         self.assertEqual(response.status_code, 200)
         assert response.json()["id_token_signing_alg_values_supported"] == ["HS256"]
 
+    def test_get_connect_discovery_info_response_types_changed(self):
+        response = self.client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+        assert "token" in response.json()["response_types_supported"]
+
+        self.oauth2_settings.OIDC_RESPONSE_TYPES_SUPPORTED = ["code"]
+        response = self.client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+        assert response.json()["response_types_supported"] == ["code"]
+
+    def test_get_connect_discovery_info_not_modified(self):
+        response = self.client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.client.get(
+            reverse("oauth2_provider:oidc-connect-discovery-info"), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        assert response.content == b""
+        assert response["ETag"] == etag
+        assert response["Access-Control-Allow-Origin"] == "*"
+
+        response = self.client.get(
+            reverse("oauth2_provider:oidc-connect-discovery-info"), HTTP_IF_NONE_MATCH='"stale"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_connect_discovery_info_cached(self):
+        self.oauth2_settings.OIDC_DISCOVERY_CACHE_ENABLE = True
+        response = self.client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+        self.assertEqual(response.status_code, 200)
+        assert response.json()["id_token_signing_alg_values_supported"] == ["RS256", "HS256"]
+        assert response["Access-Control-Allow-Origin"] == "*"
+
+        # Changing oauth2_settings directly does not invalidate the cached document
+        self.oauth2_settings.OIDC_RSA_PRIVATE_KEY = None
+        response = self.client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+        assert response.json()["id_token_signing_alg_values_supported"] == ["RS256", "HS256"]
+
+        # Changing the OAUTH2_PROVIDER setting does
+        self.oauth2_settings.update({**presets.OIDC_SETTINGS_HS256_ONLY, "OIDC_DISCOVERY_CACHE_ENABLE": True})
+        response = self.client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+        assert response.json()["id_token_signing_alg_values_supported"] == ["HS256"]
+
+    def test_get_connect_discovery_info_cached_per_script_prefix(self):
+        self.oauth2_settings.OIDC_DISCOVERY_CACHE_ENABLE = True
+        self.oauth2_settings.OIDC_ISS_ENDPOINT = None
+        self.oauth2_settings.OIDC_USERINFO_ENDPOINT = None
+        url = reverse("oauth2_provider:oidc-connect-discovery-info")
+        response = self.client.get(url)
+        assert response.json()["token_endpoint"] == "http://testserver/o/token/"
+
+        set_script_prefix("/prefix/")
+        try:
+            response = self.client.get(url)
+        finally:
+            clear_script_prefix()
+        assert response.json()["token_endpoint"] == "http://testserver/prefix/o/token/"
+
+
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+def test_get_connect_discovery_info_custom_claims(client, oauth2_settings):
+    class CustomValidator(OAuth2Validator):
+        def get_additional_claims(self):
+            return {"email": claim_user_email}
+
+    oauth2_settings.OAUTH2_VALIDATOR_CLASS = CustomValidator
+    response = client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+    assert response.json()["claims_supported"] == ["email", "sub"]
+
+
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+def test_get_connect_discovery_info_claims_not_memoized_by_default(client, oauth2_settings):
+    additional_claims = {"email": claim_user_email}
+
+    class CustomValidator(OAuth2Validator):
+        def get_additional_claims(self):
+            return additional_claims
+
+    oauth2_settings.OAUTH2_VALIDATOR_CLASS = CustomValidator
+    response = client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+    assert response.json()["claims_supported"] == ["email", "sub"]
+
+    additional_claims["name"] = claim_user_email
+    response = client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+    assert response.json()["claims_supported"] == ["email", "name", "sub"]
+
+
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+@pytest.mark.parametrize("always_reload, instances", [(True, 2), (False, 1)])
+def test_get_connect_discovery_info_validator_reuse(client, oauth2_settings, always_reload, instances):
+    init = []
+
+    class CustomValidator(OAuth2Validator):
+        def __init__(self):
+            init.append(self)
+            super().__init__()
+
+    oauth2_settings.OAUTH2_VALIDATOR_CLASS = CustomValidator
+    oauth2_settings.ALWAYS_RELOAD_OAUTHLIB_CORE = always_reload
+    for _ in range(2):
+        response = client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+        assert response.status_code == 200
+    assert len(init) == instances
+
+
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+def test_get_connect_discovery_info_request_dependent_claims(client, oauth2_settings):
+    class CustomValidator(OAuth2Validator):
+        def get_discovery_claims(self, request):
+            return ["sub", request.GET["claim"]]
+
+    oauth2_settings.OAUTH2_VALIDATOR_CLASS = CustomValidator
+    for claim in ("email", "name"):
+        response = client.get(reverse("oauth2_provider:oidc-connect-discovery-info"), {"claim": claim})
+        assert response.json()["claims_supported"] == sorted(["sub", claim])
+
+
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+def test_get_connect_discovery_info_custom_scopes_backend(client, oauth2_settings):
+    class CustomScopes(SettingsScopes):
+        def get_available_scopes(self, application=None, request=None, *args, **kwargs):
+            return {"openid": "OpenID connect", "profile": "Profile"}.keys()
+
+    oauth2_settings.SCOPES_BACKEND_CLASS = CustomScopes
+    response = client.get(reverse("oauth2_provider:oidc-connect-discovery-info"))
+    assert response.json()["scopes_supported"] == ["openid", "profile"]
+
+
+def test_cached_reverse_honours_script_prefix():
+    assert _reverse("oauth2_provider:token") == "/o/token/"
+    set_script_prefix("/prefix/")
+    try:
+        assert _reverse("oauth2_provider:token") == "/prefix/o/token/"
+    finally:
+        clear_script_prefix()
+    assert _reverse("oauth2_provider:token") == "/o/token/"
+
+
+def test_cached_reverse_honours_language():
+    set_urlconf("tests.urls_i18n")
+    try:
+        with translation.override("en"):
+            assert _reverse("oauth2_provider:token") == "/en/o/token/"
+        with translation.override("de"):
+            assert _reverse("oauth2_provider:token") == "/de/o/token/"
+    finally:
+        set_urlconf(None)
+
 
 @pytest.mark.usefixtures("oauth2_settings")
 @pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
@@ -98,6 +251,28 @@ class TestJwksInfoView(TestCase):
         self.assertEqual(response.status_code, 200)
         assert response.json() == {"keys": []}
 
+    def test_get_jwks_info_cache_control(self):
+        self.oauth2_settings.OIDC_JWKS_MAX_AGE_SECONDS = 60
+        response = self.client.get(reverse("oauth2_provider:jwks-info"))
+        self.assertEqual(response.status_code, 200)
+        assert response["Cache-Control"] == "public, max-age=60, stale-while-revalidate=60, stale-if-error=60"
+
+    def test_get_jwks_info_not_modified(self):
+        response = self.client.get(reverse("oauth2_provider:jwks-info"))
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.client.get(reverse("oauth2_provider:jwks-info"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        assert response["ETag"] == etag
+        assert response["Cache-Control"].startswith("public, max-age=")
+
+        # Rotating keys changes the ETag
+        self.oauth2_settings.OIDC_RSA_PRIVATE_KEYS_INACTIVE = []
+        response = self.client.get(reverse("oauth2_provider:jwks-info"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        assert response["ETag"] != etag
+
     def test_get_jwks_info_multiple_rsa_keys(self):
         expected_response = {
             "keys": [
@@ -124,6 +299,17 @@ class TestJwksInfoView(TestCase):
         assert response.json() == expected_response
 
 
+@pytest.mark.oauth2_settings(presets.OIDC_SETTINGS_RW)
+def test_get_jwks_info_keys_parsed_once(client, oauth2_settings, mocker):
+    _jwk_entry.cache_clear()
+    _jwks_content.cache_clear()
+    thumbprint = mocker.spy(jwk.JWK, "thumbprint")
+    for _ in range(3):
+        response = client.get(reverse("oauth2_provider:jwks-info"))
+        assert len(response.json()["keys"]) == 2
+    assert thumbprint.call_count == 2
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("method", ["get", "post"])
 def test_userinfo_endpoint(oidc_tokens, client, method):
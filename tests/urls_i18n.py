@@ -0,0 +1,7 @@
+from django.conf.urls.i18n import i18n_patterns
+from django.urls import include, path
+
+
+urlpatterns = i18n_patterns(
+    path("o/", include("oauth2_provider.urls", namespace="oauth2_provider")),
+)